@@ -3,6 +3,12 @@ import logging
 from flask import Flask
 from werkzeug.middleware.proxy_fix import ProxyFix
 
+try:
+    from flask_compress import Compress
+    COMPRESSION_AVAILABLE = True
+except ImportError:
+    COMPRESSION_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
 
@@ -11,10 +17,16 @@ app = Flask(__name__)
 app.secret_key = os.environ.get("SESSION_SECRET", "dev-secret-key-change-in-production")
 app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
 
+# Chart responses are large, highly repetitive HTML/JSON
+if COMPRESSION_AVAILABLE:
+    Compress(app)
+
 # Configuration
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['EXPORT_FOLDER'] = 'exports'
+app.config['DATAFRAME_CACHE_ENTRIES'] = 32  # Parsed files kept in memory between requests
+app.config['DATAFRAME_CACHE_BYTES'] = 512 * 1024 * 1024  # Memory budget for those files
 
 # Create upload and export directories
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
@@ -1,8 +1,9 @@
 try:
-    import plotly.graph_objects as go
     import plotly.express as px
+    import plotly.io as pio
     import pandas as pd
     import numpy as np
+    from _plotly_utils.utils import convert_to_base64
     PLOTLY_AVAILABLE = True
 except ImportError as e:
     print(f"Warning: Plotly not available: {e}")
@@ -11,52 +12,122 @@ except ImportError as e:
     class DummyPlotly:
         def __getattr__(self, name):
             return lambda *args, **kwargs: None
-    go = DummyPlotly()
     px = DummyPlotly()
+    pio = DummyPlotly()
 
+import hashlib
 import logging
+import pickle
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from data_processor import DataFrameCache
 
 logger = logging.getLogger(__name__)
 
+# Placeholder div id baked into cached HTML, swapped for a fresh id on every render
+DIV_ID_PLACEHOLDER = 'plotly-chart-__id__'
+
+def _fingerprint(values):
+    """Hashable fingerprint of an array: shape, dtype and a digest of every value"""
+    values = np.asarray(values)
+    if values.dtype == object:
+        # Object arrays hold pointers, so hash their pickled contents instead of the buffer
+        data = pickle.dumps(values.tolist(), protocol=pickle.HIGHEST_PROTOCOL)
+    else:
+        data = values.tobytes()
+    return (values.shape, str(values.dtype), hashlib.blake2b(data, digest_size=16).digest())
+
 class ChartGenerator:
-    def __init__(self):
+    def __init__(self, cache_size=64, cache_bytes=32 * 1024 * 1024, max_workers=4):
         if not PLOTLY_AVAILABLE:
             raise ImportError("Plotly is not available for chart generation")
         self.theme = 'plotly_white'  # Colorful theme for better visibility
         self.color_palette = px.colors.qualitative.Set3
+        # Resolved once: figures are plain dicts rendered without validation,
+        # so plotly.js needs the full template rather than its name
+        self._template = pio.templates[self.theme].to_plotly_json()
+        self._chart_methods = {
+            'bar': self.create_bar_chart,
+            'line': self.create_line_chart,
+            'scatter': self.create_scatter_plot,
+            'histogram': self.create_histogram,
+            'binned_histogram': self.create_binned_histogram,
+            'box': self.create_box_plot,
+            'pie': self.create_pie_chart,
+        }
+        # Bounded by bytes as well: a large scatter renders to megabytes of HTML
+        self._html_cache = DataFrameCache(max_entries=cache_size, max_bytes=cache_bytes)
+        # Long-lived so a page's charts do not pay for thread start-up
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='chart')
+    
+    def _render(self, fig_spec, build_figure):
+        """Render a figure to HTML, reusing cached output for an identical spec"""
+        html = self._html_cache.get(fig_spec)
+        if html is None:
+            figure = build_figure()
+            # go.Figure is what writes numeric arrays as base64 typed arrays, so do it here
+            convert_to_base64(figure['data'])
+            # Skipping graph_objects validation saves most of the time on small charts
+            html = pio.to_html(
+                figure,
+                include_plotlyjs=False,
+                div_id=DIV_ID_PLACEHOLDER,
+                config={'displayModeBar': False},
+                validate=False
+            )
+            self._html_cache.put(fig_spec, html, size=len(html))
+        
+        # Random rather than counted, so ids stay unique across restarts and workers
+        return html.replace(DIV_ID_PLACEHOLDER, f"plotly-chart-{uuid.uuid4().hex[:12]}")
+    
+    def _layout(self, title, x_title=None, y_title=None, **extra):
+        """Build the shared layout dict for a chart"""
+        layout = {'title': {'text': title}, 'template': self._template, 'height': 500}
+        if x_title is not None:
+            layout['xaxis'] = {'title': {'text': x_title}}
+        if y_title is not None:
+            layout['yaxis'] = {'title': {'text': y_title}}
+        layout.update(extra)
+        return layout
+    
+    def render_many(self, specs, timeout=None):
+        """Render a batch of charts, given as (chart_type, kwargs) pairs, concurrently but returned in order"""
+        futures = [self._executor.submit(self._chart_methods[chart_type], **kwargs)
+                   for chart_type, kwargs in specs]
+        
+        charts = []
+        for future in futures:
+            try:
+                charts.append(future.result(timeout=timeout))
+            except Exception as e:
+                logger.error(f"Error rendering chart: {str(e)}")
+                charts.append(None)
+        return charts
     
     def create_bar_chart(self, x_data, y_data, x_title, y_title, title=None):
         """Create an interactive bar chart"""
         try:
-            if not x_data or not y_data or len(x_data) != len(y_data):
+            # len() rather than truthiness, so numpy arrays are accepted as well as lists
+            if len(x_data) == 0 or len(y_data) == 0 or len(x_data) != len(y_data):
                 logger.error("Invalid data for bar chart")
                 return None
             
-            fig = go.Figure(data=[
-                go.Bar(
-                    x=x_data,
-                    y=y_data,
-                    marker_color=self.color_palette[0],
-                    text=y_data,
-                    textposition='auto',
-                )
-            ])
-            
-            fig.update_layout(
-                title=title or f'{y_title} by {x_title}',
-                xaxis_title=x_title,
-                yaxis_title=y_title,
-                template=self.theme,
-                height=500,
-                showlegend=False
-            )
-            
-            return fig.to_html(
-                include_plotlyjs=False, 
-                div_id=f"chart-{hash(str(x_data))}", 
-                config={'displayModeBar': False}
-            )
+            def build_figure():
+                return {
+                    'data': [{
+                        'type': 'bar',
+                        'x': x_data,
+                        'y': y_data,
+                        'marker': {'color': self.color_palette[0]},
+                        'text': y_data,
+                        'textposition': 'auto',
+                    }],
+                    'layout': self._layout(title or f'{y_title} by {x_title}', x_title, y_title, showlegend=False)
+                }
             
+            fig_spec = ('bar', _fingerprint(x_data), _fingerprint(y_data), x_title, y_title, title)
+            return self._render(fig_spec, build_figure)
+        
         except Exception as e:
             logger.error(f"Error creating bar chart: {str(e)}")
             return None
@@ -70,32 +141,25 @@ class ChartGenerator:
             
             # Sort by x column for better line chart
             df_sorted = df.sort_values(x_column)
+            x_values = df_sorted[x_column].to_numpy()
+            y_values = df_sorted[y_column].to_numpy()
             
-            fig = go.Figure(data=[
-                go.Scatter(
-                    x=df_sorted[x_column],
-                    y=df_sorted[y_column],
-                    mode='lines+markers',
-                    line=dict(color=self.color_palette[1], width=3),
-                    marker=dict(size=6)
-                )
-            ])
-            
-            fig.update_layout(
-                title=title or f'{y_column} vs {x_column}',
-                xaxis_title=x_column,
-                yaxis_title=y_column,
-                template=self.theme,
-                height=500,
-                showlegend=False
-            )
-            
-            return fig.to_html(
-                include_plotlyjs=False, 
-                div_id=f"chart-{hash(str(df_sorted[x_column].values))}", 
-                config={'displayModeBar': False}
-            )
+            def build_figure():
+                return {
+                    'data': [{
+                        'type': 'scatter',
+                        'x': x_values,
+                        'y': y_values,
+                        'mode': 'lines+markers',
+                        'line': {'color': self.color_palette[1], 'width': 3},
+                        'marker': {'size': 6},
+                    }],
+                    'layout': self._layout(title or f'{y_column} vs {x_column}', x_column, y_column, showlegend=False)
+                }
             
+            fig_spec = ('line', _fingerprint(x_values), _fingerprint(y_values), x_column, y_column, title)
+            return self._render(fig_spec, build_figure)
+        
         except Exception as e:
             logger.error(f"Error creating line chart: {str(e)}")
             return None
@@ -114,34 +178,24 @@ class ChartGenerator:
                 logger.error("No valid data points for scatter plot")
                 return None
             
-            fig = go.Figure(data=[
-                go.Scatter(
-                    x=clean_df[x_column],
-                    y=clean_df[y_column],
-                    mode='markers',
-                    marker=dict(
-                        color=self.color_palette[2],
-                        size=8,
-                        opacity=0.7
-                    )
-                )
-            ])
-            
-            fig.update_layout(
-                title=title or f'{y_column} vs {x_column}',
-                xaxis_title=x_column,
-                yaxis_title=y_column,
-                template=self.theme,
-                height=500,
-                showlegend=False
-            )
+            x_values = clean_df[x_column].to_numpy()
+            y_values = clean_df[y_column].to_numpy()
             
-            return fig.to_html(
-                include_plotlyjs=False, 
-                div_id=f"chart-{hash(str(clean_df[x_column].values))}", 
-                config={'displayModeBar': False}
-            )
+            def build_figure():
+                return {
+                    'data': [{
+                        'type': 'scatter',
+                        'x': x_values,
+                        'y': y_values,
+                        'mode': 'markers',
+                        'marker': {'color': self.color_palette[2], 'size': 8, 'opacity': 0.7},
+                    }],
+                    'layout': self._layout(title or f'{y_column} vs {x_column}', x_column, y_column, showlegend=False)
+                }
             
+            fig_spec = ('scatter', _fingerprint(x_values), _fingerprint(y_values), x_column, y_column, title)
+            return self._render(fig_spec, build_figure)
+        
         except Exception as e:
             logger.error(f"Error creating scatter plot: {str(e)}")
             return None
@@ -160,29 +214,52 @@ class ChartGenerator:
                 logger.error("No valid data for histogram")
                 return None
             
-            fig = go.Figure(data=[
-                go.Histogram(
-                    x=clean_data,
-                    marker_color=self.color_palette[3],
-                    opacity=0.8
-                )
-            ])
+            values = clean_data.to_numpy()
             
-            fig.update_layout(
-                title=title or f'Distribution of {column}',
-                xaxis_title=column,
-                yaxis_title='Frequency',
-                template=self.theme,
-                height=500,
-                showlegend=False
-            )
+            def build_figure():
+                return {
+                    'data': [{
+                        'type': 'histogram',
+                        'x': values,
+                        'marker': {'color': self.color_palette[3]},
+                        'opacity': 0.8,
+                    }],
+                    'layout': self._layout(title or f'Distribution of {column}', column, 'Frequency', showlegend=False)
+                }
             
-            return fig.to_html(
-                include_plotlyjs=False, 
-                div_id=f"chart-{hash(str(clean_data.values))}", 
-                config={'displayModeBar': False}
-            )
+            fig_spec = ('histogram', _fingerprint(values), column, title)
+            return self._render(fig_spec, build_figure)
+        
+        except Exception as e:
+            logger.error(f"Error creating histogram: {str(e)}")
+            return None
+    
+    def create_binned_histogram(self, edges, counts, column, title=None):
+        """Create an interactive histogram from precomputed bin edges and counts"""
+        try:
+            edges = np.asarray(edges, dtype=np.float64)
+            counts = np.asarray(counts)
+            if len(counts) == 0 or len(edges) != len(counts) + 1:
+                logger.error("Invalid bins for histogram")
+                return None
+            
+            def build_figure():
+                return {
+                    'data': [{
+                        'type': 'bar',
+                        'x': (edges[:-1] + edges[1:]) / 2,
+                        'y': counts,
+                        'width': np.diff(edges),
+                        'marker': {'color': self.color_palette[3]},
+                        'opacity': 0.8,
+                    }],
+                    'layout': self._layout(title or f'Distribution of {column}', column, 'Frequency',
+                                           showlegend=False, bargap=0)
+                }
             
+            fig_spec = ('binned_histogram', _fingerprint(edges), _fingerprint(counts), column, title)
+            return self._render(fig_spec, build_figure)
+        
         except Exception as e:
             logger.error(f"Error creating histogram: {str(e)}")
             return None
@@ -197,30 +274,27 @@ class ChartGenerator:
                 logger.error("No valid columns for box plot")
                 return None
             
-            fig = go.Figure()
-            
+            traces = []
             for i, column in enumerate(valid_columns):
                 clean_data = df[column].dropna()
                 if not clean_data.empty:
-                    fig.add_trace(go.Box(
-                        y=clean_data,
-                        name=column,
-                        marker_color=self.color_palette[i % len(self.color_palette)]
-                    ))
-            
-            fig.update_layout(
-                title=title or f'Box Plot of {", ".join(valid_columns)}',
-                yaxis_title='Values',
-                template=self.theme,
-                height=500
-            )
+                    traces.append((i, column, clean_data.to_numpy()))
             
-            return fig.to_html(
-                include_plotlyjs=False, 
-                div_id=f"chart-{hash(str(valid_columns))}", 
-                config={'displayModeBar': False}
-            )
+            def build_figure():
+                return {
+                    'data': [{
+                        'type': 'box',
+                        'y': values,
+                        'name': column,
+                        'marker': {'color': self.color_palette[i % len(self.color_palette)]},
+                    } for i, column, values in traces],
+                    'layout': self._layout(title or f'Box Plot of {", ".join(valid_columns)}', y_title='Values')
+                }
             
+            fig_spec = ('box', tuple((column, _fingerprint(values)) for _, column, values in traces),
+                        tuple(valid_columns), title)
+            return self._render(fig_spec, build_figure)
+        
         except Exception as e:
             logger.error(f"Error creating box plot: {str(e)}")
             return None
@@ -228,30 +302,24 @@ class ChartGenerator:
     def create_pie_chart(self, labels, values, title=None):
         """Create an interactive pie chart"""
         try:
-            if not labels or not values or len(labels) != len(values):
+            if len(labels) == 0 or len(values) == 0 or len(labels) != len(values):
                 logger.error("Invalid data for pie chart")
                 return None
             
-            fig = go.Figure(data=[
-                go.Pie(
-                    labels=labels,
-                    values=values,
-                    marker_colors=self.color_palette[:len(labels)]
-                )
-            ])
-            
-            fig.update_layout(
-                title=title or 'Distribution',
-                template=self.theme,
-                height=500
-            )
-            
-            return fig.to_html(
-                include_plotlyjs=False, 
-                div_id=f"chart-{hash(str(labels))}", 
-                config={'displayModeBar': False}
-            )
+            def build_figure():
+                return {
+                    'data': [{
+                        'type': 'pie',
+                        'labels': labels,
+                        'values': values,
+                        'marker': {'colors': self.color_palette[:len(labels)]},
+                    }],
+                    'layout': self._layout(title or 'Distribution')
+                }
             
+            fig_spec = ('pie', _fingerprint(labels), _fingerprint(values), title)
+            return self._render(fig_spec, build_figure)
+        
         except Exception as e:
             logger.error(f"Error creating pie chart: {str(e)}")
             return None
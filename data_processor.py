@@ -1,35 +1,367 @@
 import pandas as pd
 import numpy as np
+import codecs
+import datetime
+import functools
+import io
 import logging
-from sklearn.ensemble import IsolationForest
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+try:
+    from charset_normalizer import from_bytes
+    CHARSET_DETECTION_AVAILABLE = True
+except ImportError:
+    CHARSET_DETECTION_AVAILABLE = False
+
+try:
+    import pyarrow  # noqa: F401 - enables pandas' Arrow CSV engine
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+    from pandas._libs.parsers import STR_NA_VALUES
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _outlier_row_mask(values, lower_bounds, upper_bounds):
+        """Flag rows where any value falls outside its column's bounds, in one pass"""
+        mask = np.zeros(values.shape[0], dtype=np.bool_)
+        for i in prange(values.shape[0]):
+            for j in range(values.shape[1]):
+                if values[i, j] < lower_bounds[j] or values[i, j] > upper_bounds[j]:
+                    mask[i] = True
+                    break
+        return mask
+    
+    @njit(cache=True)
+    def _scatter_add(codes, values, out):
+        """Add each value into its group's slot of out, in one pass"""
+        for i in range(codes.shape[0]):
+            out[codes[i]] += values[i]
+        return out
+else:
+    def _outlier_row_mask(values, lower_bounds, upper_bounds):
+        """Flag rows where any value falls outside its column's bounds"""
+        return np.any((values < lower_bounds) | (values > upper_bounds), axis=1)
+    
+    def _scatter_add(codes, values, out):
+        """Add each value into its group's slot of out"""
+        np.add.at(out, codes, values)
+        return out
+
+@functools.lru_cache(maxsize=8)
+def _open_excel(file_path, mtime):
+    """Open a workbook once per file version; hold the returned lock while parsing it"""
+    # Read into memory so no handle stays open on a file that may be deleted
+    with open(file_path, 'rb') as f:
+        return pd.ExcelFile(io.BytesIO(f.read())), threading.Lock()
+
+class _FrameCache:
+    """Per-frame memo keyed weakly on the block manager, so entries die with the frame"""
+    
+    def __init__(self):
+        self._entries = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+    
+    def get(self, df, compute):
+        mgr = df._mgr
+        with self._lock:
+            cached = self._entries.get(mgr)
+        
+        # Column assignment swaps the manager's blocks or columns, which invalidates the entry
+        if cached is not None:
+            columns_ref, block_refs, value = cached
+            if (columns_ref() is df.columns and len(block_refs) == len(mgr.blocks)
+                    and all(ref() is block for ref, block in zip(block_refs, mgr.blocks))):
+                return value
+        
+        value = compute(df)
+        with self._lock:
+            self._entries[mgr] = (
+                weakref.ref(df.columns),
+                tuple(weakref.ref(block) for block in mgr.blocks),
+                value
+            )
+        return value
+
+_dtype_bucket_cache = _FrameCache()
+_frame_scan_cache = _FrameCache()
+
+def dtype_buckets(df):
+    """Return (numeric, categorical, datetime) column indexes, cached for the frame's lifetime"""
+    return _dtype_bucket_cache.get(df, lambda df: (
+        df.select_dtypes(include=[np.number]).columns,
+        df.select_dtypes(include=['object']).columns,
+        df.select_dtypes(include=['datetime64']).columns
+    ))
+
+@dataclass(frozen=True)
+class FrameScan:
+    """Whole-frame statistics shared by the stats, quality and report builders"""
+    duplicate_rows: int
+    missing_values: pd.Series
+    dtypes: pd.Series
+    memory_usage: pd.Series
+    index_memory_usage: int
+    describe: Optional[pd.DataFrame]
+    
+    @classmethod
+    def from_frame(cls, df, describe=pd.DataFrame.describe):
+        numeric_columns = dtype_buckets(df)[0]
+        return cls(
+            duplicate_rows=int(df.duplicated().sum()),
+            missing_values=df.isnull().sum(),
+            dtypes=df.dtypes,
+            memory_usage=df.memory_usage(deep=True, index=False),
+            index_memory_usage=int(df.index.memory_usage(deep=True)),
+            describe=describe(df[numeric_columns]) if len(numeric_columns) > 0 else None
+        )
+
+class DataFrameCache:
+    """LRU of parsed dataframes, and values derived from them, bounded by entry count and total memory"""
+    
+    def __init__(self, max_entries=32, max_bytes=512 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+    
+    def put(self, key, df, size=None):
+        if size is None:
+            size = int(df.memory_usage(deep=True).sum())
+        with self._lock:
+            old_entry = self._entries.pop(key, None)
+            if old_entry is not None:
+                self._total_bytes -= old_entry[1]
+            
+            # A frame larger than the whole budget is simply not cached
+            if size > self.max_bytes:
+                return
+            
+            self._entries[key] = (df, size)
+            self._total_bytes += size
+            while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+
 class DataProcessor:
     def __init__(self):
         self.max_rows = 100000
         self.encodings = ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252']
+        self.encoding_sample_size = 64 * 1024
+        self.column_major_min_rows = 10000
+        self.parallel_min_columns = 64
+        self.max_workers = min(8, os.cpu_count() or 1)
+    
+    @staticmethod
+    def _downcast_numeric(df):
+        """Shrink int64 columns to the narrowest integer dtype that holds every value"""
+        # Floats stay float64: pandas reduces float32 columns in float32, which skews means
+        target_dtypes = {}
+        
+        int_df = df.select_dtypes(include=['int64'])
+        if not int_df.empty:
+            mins, maxs = int_df.min(), int_df.max()
+            for col in int_df.columns:
+                for dtype in (np.int8, np.int16, np.int32):
+                    info = np.iinfo(dtype)
+                    if info.min <= mins[col] and maxs[col] <= info.max:
+                        target_dtypes[col] = dtype
+                        break
+        
+        return df.astype(target_dtypes) if target_dtypes else df
+    
+    def _ensure_column_major(self, df):
+        """Copy the frame if any block lays rows out contiguously instead of columns"""
+        if len(df) <= self.column_major_min_rows:
+            return df
+        
+        # Blocks are stored as (columns, rows), so C order keeps each column contiguous
+        blocks = getattr(getattr(df, '_mgr', None), 'blocks', ())
+        if any(isinstance(block.values, np.ndarray) and block.values.ndim == 2
+               and not block.values.flags['C_CONTIGUOUS'] for block in blocks):
+            logger.debug("Re-laying out dataframe blocks as column-major")
+            return df.copy()
+        
+        return df
+    
+    def _detect_encoding(self, file_path):
+        """Guess a CSV file's encoding from its first bytes, or None if unsure"""
+        if not CHARSET_DETECTION_AVAILABLE:
+            return None
+        
+        with open(file_path, 'rb') as f:
+            sample = f.read(self.encoding_sample_size)
+        # Cut at the last line break so the sample cannot end inside a multibyte character
+        if len(sample) == self.encoding_sample_size and b'\n' in sample:
+            sample = sample[:sample.rindex(b'\n') + 1]
+        
+        # Valid UTF-8 is almost never something else, so check it before any single-byte guess
+        try:
+            sample.decode('utf-8')
+            return 'utf-8'
+        except UnicodeDecodeError:
+            pass
+        
+        # Only consider the encodings we would otherwise try one by one
+        best_match = from_bytes(sample, cp_isolation=self.encodings).best()
+        if best_match is None:
+            return None
+        
+        # Plain ASCII samples may still hold UTF-8 further down the file
+        return 'utf-8' if best_match.encoding == 'ascii' else best_match.encoding
+    
+    @staticmethod
+    def _has_undecoded_text(df):
+        """Check whether the Arrow reader left any text column as raw bytes"""
+        for _, values in df.select_dtypes(include=['object']).items():
+            first_valid = values.first_valid_index()
+            if first_valid is not None and isinstance(values.loc[first_valid], bytes):
+                return True
+        return False
+    
+    @staticmethod
+    def _arrow_temporal_columns(df):
+        """Columns the Arrow reader parsed as dates, times or timestamps, which the C engine keeps as text"""
+        columns = [col for col, dtype in df.dtypes.items()
+                   if pd.api.types.is_datetime64_any_dtype(dtype) or pd.api.types.is_timedelta64_dtype(dtype)]
+        # Arrow object columns hold one type throughout, so the first value is representative
+        for col, values in df.select_dtypes(include=['object']).items():
+            first_valid = values.first_valid_index()
+            if first_valid is not None and isinstance(values.loc[first_valid], (datetime.date, datetime.time)):
+                columns.append(col)
+        return columns
+    
+    @staticmethod
+    def _reread_as_text(df, file_path, encoding, columns, dtype=None):
+        """Replace columns with their source text, re-reading only those columns with Arrow"""
+        table = pa_csv.read_csv(
+            file_path,
+            read_options=pa_csv.ReadOptions(encoding=encoding),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=columns,
+                column_types=dict.fromkeys(columns, pyarrow.string()),
+                null_values=list(STR_NA_VALUES),  # The NA spellings pandas passes to Arrow
+                strings_can_be_null=True
+            )
+        )
+        df = df.copy(deep=False)
+        for col in columns:
+            text = table.column(col).to_pandas().set_axis(df.index)
+            df[col] = text.astype(dtype[col]) if dtype and col in dtype else text
+        return df
+    
+    @staticmethod
+    def _count_csv_rows(file_path):
+        """Count data rows by scanning for newlines, which is far cheaper than parsing"""
+        line_count = 0
+        last_chunk = b''
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                line_count += chunk.count(b'\n')
+                last_chunk = chunk
+        if last_chunk and not last_chunk.endswith(b'\n'):
+            line_count += 1
+        return max(line_count - 1, 0)  # Exclude the header line
+    
+    def _read_csv_with_encoding(self, file_path, encoding, nrows=None, dtype=None, usecols=None):
+        """Parse a CSV file with the Arrow engine when available, else the C engine"""
+        # The Arrow engine cannot stop early, so truncated reads use the C engine
+        if PYARROW_AVAILABLE and nrows is None:
+            try:
+                df = pd.read_csv(file_path, encoding=encoding, engine='pyarrow', dtype=dtype, usecols=usecols)
+                # Arrow keeps undecodable text as bytes rather than raising, so let
+                # the C engine below raise UnicodeDecodeError for this encoding
+                if not self._has_undecoded_text(df):
+                    # Arrow infers dates and timestamps the C engine leaves as strings
+                    temporal_columns = self._arrow_temporal_columns(df)
+                    if temporal_columns:
+                        df = self._reread_as_text(df, file_path, encoding, temporal_columns, dtype)
+                    return df
+            except (ImportError, KeyError, TypeError, ValueError) as e:
+                logger.debug(f"Arrow CSV engine failed, using default engine: {str(e)}")
+        
+        return pd.read_csv(file_path, encoding=encoding, nrows=nrows, dtype=dtype, usecols=usecols)
+    
+    @staticmethod
+    def _parser_dtypes(dtype):
+        """Drop dtypes the CSV and Excel readers only accept through parse_dates"""
+        if not dtype:
+            return None
+        return {col: col_type for col, col_type in dtype.items()
+                if not str(col_type).startswith(('datetime', 'timedelta'))}
+    
+    def _read_csv(self, file_path, nrows=None, dtype=None, usecols=None):
+        """Read a CSV file, trying the detected encoding before the fallback list"""
+        detected_encoding = self._detect_encoding(file_path)
+        encodings = [detected_encoding] if detected_encoding else []
+        encodings += [encoding for encoding in self.encodings
+                      if not detected_encoding
+                      or codecs.lookup(encoding).name != codecs.lookup(detected_encoding).name]
+        
+        for encoding in encodings:
+            try:
+                df = self._read_csv_with_encoding(file_path, encoding, nrows=nrows, dtype=dtype, usecols=usecols)
+                logger.info(f"Successfully loaded CSV with {encoding} encoding")
+                return df
+            except UnicodeDecodeError:
+                continue
+        
+        return None
     
-    def load_data(self, file_path):
-        """Load data from CSV or Excel file with multiple encoding support"""
+    def load_data(self, file_path, dtype=None, usecols=None, reuse_workbook=True):
+        """Load data from CSV, Excel or Parquet file, optionally with known dtypes and only some columns"""
         try:
             file_extension = file_path.lower().split('.')[-1]
+            # Known dtypes spare the text readers their type inference pass
+            dtype = self._parser_dtypes(dtype)
             
-            if file_extension == 'csv':
-                # Try different encodings for CSV
-                for encoding in self.encodings:
-                    try:
-                        df = pd.read_csv(file_path, encoding=encoding)
-                        logger.info(f"Successfully loaded CSV with {encoding} encoding")
-                        break
-                    except UnicodeDecodeError:
-                        continue
-                else:
+            if file_extension == 'parquet':
+                # Columnar file written at upload time: no parsing, only the requested columns
+                df = pd.read_parquet(file_path, columns=usecols)
+                total_rows = len(df)
+                too_large = total_rows > self.max_rows
+            
+            elif file_extension == 'csv':
+                # Only parse the rows we keep
+                total_rows = self._count_csv_rows(file_path)
+                too_large = total_rows > self.max_rows
+                df = self._read_csv(file_path, nrows=self.max_rows if too_large else None,
+                                    dtype=dtype, usecols=usecols)
+                if df is None:
                     logger.error("Failed to load CSV with any encoding")
                     return None
             
             elif file_extension in ['xlsx', 'xls']:
-                df = pd.read_excel(file_path)
+                # One extra row tells us whether the sheet had to be truncated
+                df = self._parse_excel(file_path, reuse_workbook=reuse_workbook,
+                                       nrows=self.max_rows + 1, dtype=dtype, usecols=usecols)
+                too_large = len(df) > self.max_rows
+                total_rows = f"more than {self.max_rows}"
                 logger.info("Successfully loaded Excel file")
             
             else:
@@ -42,34 +374,126 @@ class DataProcessor:
                 return None
             
             # Limit rows for performance
-            if len(df) > self.max_rows:
-                logger.warning(f"Dataset too large ({len(df)} rows). Limiting to {self.max_rows} rows")
+            if too_large:
+                logger.warning(f"Dataset too large ({total_rows} rows). Limiting to {self.max_rows} rows")
                 df = df.head(self.max_rows)
             
-            return df
+            # Fewer bytes per value means less memory traffic for every later reduction
+            df = self._downcast_numeric(df)
+            
+            # Pay for one copy now so every later column reduction reads contiguous memory
+            return self._ensure_column_major(df)
             
         except Exception as e:
             logger.error(f"Error loading data: {str(e)}")
             return None
     
+    @staticmethod
+    def _parse_excel(file_path, reuse_workbook=True, **kwargs):
+        """Parse the first sheet of a workbook, reusing the opened workbook across calls"""
+        if not reuse_workbook:
+            # One-shot parses skip the cache so it never pins a file about to be deleted
+            return pd.read_excel(file_path, sheet_name=0, **kwargs)
+        excel_file, lock = _open_excel(file_path, os.path.getmtime(file_path))
+        with lock:
+            return excel_file.parse(0, **kwargs)
+    
+    def load_head(self, file_path, n=20):
+        """Read only the first n rows of a file, for previews"""
+        try:
+            file_extension = file_path.lower().split('.')[-1]
+            
+            if file_extension == 'parquet':
+                # Decode a single batch instead of the whole file
+                parquet_file = pq.ParquetFile(file_path)
+                batch = next(parquet_file.iter_batches(batch_size=n), None)
+                if batch is None:
+                    return parquet_file.schema_arrow.empty_table().to_pandas()
+                return batch.to_pandas()
+            
+            if file_extension == 'csv':
+                return self._read_csv(file_path, nrows=n)
+            
+            if file_extension in ['xlsx', 'xls']:
+                return self._parse_excel(file_path, nrows=n)
+            
+            logger.error(f"Unsupported file format: {file_extension}")
+            return None
+            
+        except Exception as e:
+            logger.error(f"Error loading data head: {str(e)}")
+            return None
+    
+    def convert_to_parquet(self, df, file_path):
+        """Write df as Snappy Parquet next to file_path and return the new path, or None if not possible"""
+        if not PYARROW_AVAILABLE:
+            return None
+        
+        parquet_path = os.path.splitext(file_path)[0] + '.parquet'
+        try:
+            df.to_parquet(parquet_path, engine='pyarrow', compression='snappy', index=False)
+            return parquet_path
+        except Exception as e:
+            # Non-string headers or mixed-type object columns have no Arrow schema
+            logger.warning(f"Could not convert {file_path} to Parquet: {str(e)}")
+            if os.path.exists(parquet_path):
+                os.remove(parquet_path)
+            return None
+    
+    def _by_column_chunks(self, func, df, axis=0):
+        """Apply func to column chunks of a wide frame on threads and concatenate the results"""
+        if len(df.columns) < self.parallel_min_columns or self.max_workers < 2:
+            return func(df)
+        
+        # Pandas releases the GIL inside its numeric reductions, so threads scale here
+        chunk_size = -(-len(df.columns) // self.max_workers)
+        chunks = [df.iloc[:, i:i + chunk_size] for i in range(0, len(df.columns), chunk_size)]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return pd.concat(list(executor.map(func, chunks)), axis=axis)
+    
+    @staticmethod
+    def _iqr_outlier_summary(numeric_df):
+        """Outlier count and 1.5 * IQR bounds for every column of a numeric frame"""
+        quartiles = numeric_df.quantile([0.25, 0.75])
+        Q1 = quartiles.loc[0.25]
+        Q3 = quartiles.loc[0.75]
+        IQR = Q3 - Q1
+        lower_bounds = Q1 - 1.5 * IQR
+        upper_bounds = Q3 + 1.5 * IQR
+        
+        outlier_counts = ((numeric_df < lower_bounds) | (numeric_df > upper_bounds)).sum()
+        return pd.DataFrame({
+            'count': outlier_counts,
+            'lower_bound': lower_bounds,
+            'upper_bound': upper_bounds
+        })
+    
+    def scan(self, df):
+        """Scan the frame once for the statistics the stats, quality and report views share"""
+        return _frame_scan_cache.get(df, lambda df: FrameScan.from_frame(
+            df, describe=lambda numeric_df: self._by_column_chunks(pd.DataFrame.describe, numeric_df, axis=1)
+        ))
+    
     def get_basic_stats(self, df):
         """Get basic statistics about the dataframe"""
         try:
+            numeric_columns, categorical_columns, datetime_columns = dtype_buckets(df)
+            scan = self.scan(df)
             stats = {
                 'shape': df.shape,
                 'columns': list(df.columns),
-                'dtypes': df.dtypes.to_dict(),
-                'missing_values': df.isnull().sum().to_dict(),
-                'duplicate_rows': df.duplicated().sum(),
-                'memory_usage': df.memory_usage(deep=True).sum(),
-                'numeric_columns': list(df.select_dtypes(include=[np.number]).columns),
-                'categorical_columns': list(df.select_dtypes(include=['object']).columns),
-                'datetime_columns': list(df.select_dtypes(include=['datetime64']).columns)
+                'dtypes': scan.dtypes.to_dict(),
+                'missing_values': scan.missing_values.to_dict(),
+                'duplicate_rows': scan.duplicate_rows,
+                'memory_usage': scan.memory_usage.sum() + scan.index_memory_usage,
+                'numeric_columns': list(numeric_columns),
+                'categorical_columns': list(categorical_columns),
+                'datetime_columns': list(datetime_columns)
             }
             
             # Add descriptive statistics for numeric columns
-            if stats['numeric_columns']:
-                stats['describe'] = df[stats['numeric_columns']].describe().to_dict()
+            if scan.describe is not None:
+                stats['describe'] = scan.describe.to_dict()
             
             return stats
             
@@ -80,18 +504,18 @@ class DataProcessor:
     def get_data_quality_info(self, df):
         """Get detailed data quality information"""
         try:
+            scan = self.scan(df)
             quality_info = {
                 'total_rows': len(df),
                 'total_columns': len(df.columns),
                 'missing_data': {},
-                'duplicate_rows': df.duplicated().sum(),
-                'data_types': df.dtypes.to_dict(),
+                'duplicate_rows': scan.duplicate_rows,
+                'data_types': scan.dtypes.to_dict(),
                 'outliers': {}
             }
             
             # Missing data analysis
-            for col in df.columns:
-                missing_count = df[col].isnull().sum()
+            for col, missing_count in scan.missing_values.items():
                 if missing_count > 0:
                     quality_info['missing_data'][col] = {
                         'count': int(missing_count),
@@ -99,28 +523,23 @@ class DataProcessor:
                     }
             
             # Outlier detection for numeric columns
-            numeric_columns = df.select_dtypes(include=[np.number]).columns
-            for col in numeric_columns:
-                if df[col].notna().sum() > 10:  # Need at least 10 non-null values
-                    try:
-                        # Use IQR method for outlier detection
-                        Q1 = df[col].quantile(0.25)
-                        Q3 = df[col].quantile(0.75)
-                        IQR = Q3 - Q1
-                        lower_bound = Q1 - 1.5 * IQR
-                        upper_bound = Q3 + 1.5 * IQR
-                        
-                        outliers = df[(df[col] < lower_bound) | (df[col] > upper_bound)][col]
-                        
-                        if len(outliers) > 0:
-                            quality_info['outliers'][col] = {
-                                'count': len(outliers),
-                                'percentage': round((len(outliers) / len(df)) * 100, 2),
-                                'lower_bound': lower_bound,
-                                'upper_bound': upper_bound
-                            }
-                    except Exception as e:
-                        logger.warning(f"Could not detect outliers for {col}: {str(e)}")
+            numeric_columns = dtype_buckets(df)[0]
+            # Need at least 10 non-null values
+            numeric_columns = numeric_columns[(df[numeric_columns].notna().sum() > 10).to_numpy()]
+            if len(numeric_columns) > 0:
+                try:
+                    # Use IQR method for outlier detection, all columns in one batch
+                    summary = self._by_column_chunks(self._iqr_outlier_summary, df[numeric_columns])
+                    
+                    for col, row in summary[summary['count'] > 0].iterrows():
+                        quality_info['outliers'][col] = {
+                            'count': int(row['count']),
+                            'percentage': round((row['count'] / len(df)) * 100, 2),
+                            'lower_bound': row['lower_bound'],
+                            'upper_bound': row['upper_bound']
+                        }
+                except Exception as e:
+                    logger.warning(f"Could not detect outliers: {str(e)}")
             
             return quality_info
             
@@ -128,23 +547,68 @@ class DataProcessor:
             logger.error(f"Error getting data quality info: {str(e)}")
             return {}
     
+    @staticmethod
+    def group_sum(codes, n_groups, values):
+        """Per-group sums of a numeric column, given pd.factorize codes, as groupby().sum() computes them"""
+        valid = codes >= 0
+        if pd.api.types.is_bool_dtype(values.dtype) or (
+                pd.api.types.is_integer_dtype(values.dtype) and not values.hasnans):
+            # Exact integer sums, as groupby gives for integer columns
+            values = values.to_numpy(dtype=np.int64)
+            out = np.zeros(n_groups, dtype=np.int64)
+        else:
+            values = values.to_numpy(dtype=np.float64, na_value=np.nan)
+            out = np.zeros(n_groups, dtype=np.float64)
+            valid &= ~np.isnan(values)
+        return _scatter_add(codes[valid], values[valid], out)
+    
+    @staticmethod
+    def histogram_bins(series, max_bins=100):
+        """Histogram bin edges and counts for a numeric column, or None if it has no finite values"""
+        try:
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        except (TypeError, ValueError):
+            return None
+        values = values[np.isfinite(values)]
+        if values.size == 0:
+            return None
+        
+        if pd.api.types.is_integer_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype):
+            # Integer-aligned edges: float bin widths leave empty or uneven bins between integers
+            low, high = values.min(), values.max()
+            width = max(int(np.ceil((high - low + 1) / max_bins)), 1)
+            n_bins = int(np.ceil((high - low + 1) / width))
+            edges = low - 0.5 + width * np.arange(n_bins + 1)
+        else:
+            edges = np.histogram_bin_edges(values, bins='auto')
+        if len(edges) > max_bins + 1:
+            edges = np.histogram_bin_edges(values, bins=max_bins)
+        counts, edges = np.histogram(values, bins=edges)
+        return edges, counts
+    
     def handle_missing_values(self, df, strategy='drop'):
         """Handle missing values in the dataframe"""
         try:
             if strategy == 'drop':
                 return df.dropna()
             elif strategy == 'fill_mean':
-                numeric_columns = df.select_dtypes(include=[np.number]).columns
-                df[numeric_columns] = df[numeric_columns].fillna(df[numeric_columns].mean())
+                # A Series of fill values aligns on column names, so one call fills every column
+                numeric_columns = dtype_buckets(df)[0]
+                df.fillna(df[numeric_columns].mean(), inplace=True)
                 return df
             elif strategy == 'fill_median':
-                numeric_columns = df.select_dtypes(include=[np.number]).columns
-                df[numeric_columns] = df[numeric_columns].fillna(df[numeric_columns].median())
+                numeric_columns = dtype_buckets(df)[0]
+                df.fillna(df[numeric_columns].median(), inplace=True)
                 return df
             elif strategy == 'fill_mode':
-                for col in df.columns:
-                    if df[col].dtype == 'object':
-                        df[col] = df[col].fillna(df[col].mode().iloc[0] if not df[col].mode().empty else 'Unknown')
+                categorical_columns = dtype_buckets(df)[1]
+                has_missing = df[categorical_columns].isnull().any()
+                top_values = {}
+                for col in has_missing[has_missing].index:
+                    # A hash count finds the most frequent value without mode()'s sort
+                    counts = df[col].value_counts(dropna=True)
+                    top_values[col] = counts.idxmax() if not counts.empty else 'Unknown'
+                df.fillna(top_values, inplace=True)
                 return df
             else:
                 return df
@@ -166,10 +630,10 @@ class DataProcessor:
             logger.error(f"Error removing duplicates: {str(e)}")
             return df
     
-    def remove_outliers(self, df):
-        """Remove outliers using Isolation Forest"""
+    def remove_outliers(self, df, method='iqr'):
+        """Remove outliers using the IQR rule, or Isolation Forest with method='iforest'"""
         try:
-            numeric_columns = df.select_dtypes(include=[np.number]).columns
+            numeric_columns = dtype_buckets(df)[0]
             
             if len(numeric_columns) == 0:
                 logger.warning("No numeric columns found for outlier removal")
@@ -185,28 +649,48 @@ class DataProcessor:
                 logger.warning("No valid numeric columns for outlier detection")
                 return df
             
-            # Prepare data for outlier detection
-            data_for_outliers = df[valid_columns].dropna()
-            
-            if len(data_for_outliers) < 10:
-                logger.warning("Insufficient data for outlier detection")
-                return df
+            if method == 'iforest':
+                return self._remove_outliers_iforest(df, valid_columns)
             
-            # Apply Isolation Forest
-            iso_forest = IsolationForest(contamination=0.1, random_state=42)
-            outlier_labels = iso_forest.fit_predict(data_for_outliers)
+            # Same 1.5 * IQR bounds as get_data_quality_info, applied to all columns at once
+            Q1, Q3 = df[valid_columns].quantile([0.25, 0.75]).to_numpy()
+            IQR = Q3 - Q1
+            values = df[valid_columns].to_numpy(dtype=np.float64, na_value=np.nan)
+            outlier_rows = _outlier_row_mask(values, Q1 - 1.5 * IQR, Q3 + 1.5 * IQR)
             
-            # Get indices of non-outliers
-            non_outlier_indices = data_for_outliers.index[outlier_labels == 1]
-            
-            # Filter original dataframe
-            df_clean = df.loc[non_outlier_indices]
+            df_clean = df[~outlier_rows]
             
             removed_count = len(df) - len(df_clean)
-            logger.info(f"Removed {removed_count} outlier rows using Isolation Forest")
+            logger.info(f"Removed {removed_count} outlier rows using the IQR method")
             
             return df_clean
             
         except Exception as e:
             logger.error(f"Error removing outliers: {str(e)}")
             return df
+    
+    def _remove_outliers_iforest(self, df, valid_columns):
+        """Remove outliers using Isolation Forest"""
+        from sklearn.ensemble import IsolationForest
+        
+        # Prepare data for outlier detection
+        data_for_outliers = df[valid_columns].dropna()
+        
+        if len(data_for_outliers) < 10:
+            logger.warning("Insufficient data for outlier detection")
+            return df
+        
+        # Apply Isolation Forest
+        iso_forest = IsolationForest(contamination=0.1, random_state=42)
+        outlier_labels = iso_forest.fit_predict(data_for_outliers)
+        
+        # Get indices of non-outliers
+        non_outlier_indices = data_for_outliers.index[outlier_labels == 1]
+        
+        # Filter original dataframe
+        df_clean = df.loc[non_outlier_indices]
+        
+        removed_count = len(df) - len(df_clean)
+        logger.info(f"Removed {removed_count} outlier rows using Isolation Forest")
+        
+        return df_clean
\ No newline at end of file
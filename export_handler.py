@@ -2,13 +2,45 @@ import os
 import json
 import pandas as pd
 import logging
-from datetime import datetime
+from datetime import date, datetime, time
+from data_processor import FrameScan
+
+try:
+    import xlsxwriter  # noqa: F401 - faster engine for pandas' ExcelWriter
+    XLSXWRITER_AVAILABLE = True
+except ImportError:
+    XLSXWRITER_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+def _orjson_default(value):
+    """Serialize the pandas and datetime scalars orjson is not given natively"""
+    if value is pd.NaT:
+        return None
+    if isinstance(value, (pd.Timestamp, pd.Timedelta)):
+        return value.value // 10**6  # Epoch milliseconds; .value is nanoseconds whatever the unit
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
 class ExportHandler:
     def __init__(self):
         self.supported_formats = ['csv', 'xlsx', 'json']
+        self.report_engine = 'xlsxwriter' if XLSXWRITER_AVAILABLE else 'openpyxl'
+        self.sample_rows = 1000
     
     def export_data(self, df, format, export_folder):
         """Export dataframe to specified format"""
@@ -22,11 +54,11 @@ class ExportHandler:
             filepath = os.path.join(export_folder, filename)
             
             if format == 'csv':
-                df.to_csv(filepath, index=False)
+                self._write_csv(df, filepath)
             elif format == 'xlsx':
                 df.to_excel(filepath, index=False, engine='openpyxl')
             elif format == 'json':
-                df.to_json(filepath, orient='records', indent=2)
+                self._write_json(df, filepath)
             
             logger.info(f"Data exported to {filepath}")
             return filepath
@@ -35,27 +67,79 @@ class ExportHandler:
             logger.error(f"Error exporting data: {str(e)}")
             return None
     
-    def export_summary_report(self, df, export_folder):
+    def _write_csv(self, df, filepath):
+        """Write CSV with Arrow's C writer for all-integer frames, else with pandas"""
+        # Arrow quotes every string, writes whole floats as 2 and spells booleans and
+        # timestamps its own way, so only integer columns come out as to_csv writes them
+        arrow_compatible = len(df.columns) > 0 and all(
+            pd.api.types.is_integer_dtype(dtype) for dtype in df.dtypes
+        )
+        
+        if PYARROW_AVAILABLE and arrow_compatible:
+            try:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                with open(filepath, 'wb') as f:
+                    # Arrow also quotes every header name, so pandas writes the header line
+                    f.write(df.iloc[:0].to_csv(index=False).encode('utf-8'))
+                    pa_csv.write_csv(table, f, pa_csv.WriteOptions(include_header=False, quoting_style='needed'))
+                return
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+                logger.debug(f"Arrow CSV writer failed, using pandas: {str(e)}")
+        
+        df.to_csv(filepath, index=False)
+    
+    def _write_json(self, df, filepath):
+        """Write records JSON with orjson, falling back to pandas' encoder"""
+        if ORJSON_AVAILABLE:
+            try:
+                payload = orjson.dumps(
+                    df.to_dict(orient='records'),
+                    default=_orjson_default,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME
+                )
+                with open(filepath, 'wb') as f:
+                    f.write(payload)
+                return
+            except orjson.JSONEncodeError as e:
+                logger.debug(f"orjson could not encode data, using pandas: {str(e)}")
+        
+        # to_json reads non-nanosecond datetimes as nanoseconds, so widen them first
+        widen = [col for col, dtype in df.dtypes.items()
+                 if (pd.api.types.is_datetime64_any_dtype(dtype) or pd.api.types.is_timedelta64_dtype(dtype))
+                 and df[col].dt.unit != 'ns']
+        if widen:
+            df = df.copy(deep=False)
+            for col in widen:
+                df[col] = df[col].dt.as_unit('ns')
+        
+        df.to_json(filepath, orient='records', indent=2)
+    
+    def export_summary_report(self, df, export_folder, scan=None):
         """Export comprehensive summary report"""
         try:
+            # Reuse the caller's whole-frame scan when it already has one
+            if scan is None:
+                scan = FrameScan.from_frame(df)
+            
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"data_analysis_report_{timestamp}.xlsx"
             filepath = os.path.join(export_folder, filename)
             
-            with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-                # Sheet 1: Original Data Sample
-                df.head(1000).to_excel(writer, sheet_name='Data Sample', index=False)
+            with pd.ExcelWriter(filepath, engine=self.report_engine) as writer:
+                # Sheet 1: Original Data Sample (a positional view, not a copy)
+                sample_df = df.iloc[:self.sample_rows] if len(df) > self.sample_rows else df
+                sample_df.to_excel(writer, sheet_name='Data Sample', index=False)
                 
                 # Sheet 2: Basic Statistics
-                stats_df = self._create_stats_dataframe(df)
+                stats_df = self._create_stats_dataframe(df, scan)
                 stats_df.to_excel(writer, sheet_name='Statistics', index=True)
                 
                 # Sheet 3: Data Quality Report
-                quality_df = self._create_quality_dataframe(df)
+                quality_df = self._create_quality_dataframe(df, scan)
                 quality_df.to_excel(writer, sheet_name='Data Quality', index=False)
                 
                 # Sheet 4: Column Information
-                column_info_df = self._create_column_info_dataframe(df)
+                column_info_df = self._create_column_info_dataframe(df, scan)
                 column_info_df.to_excel(writer, sheet_name='Column Info', index=False)
             
             logger.info(f"Summary report exported to {filepath}")
@@ -65,66 +149,63 @@ class ExportHandler:
             logger.error(f"Error creating summary report: {str(e)}")
             return None
     
-    def _create_stats_dataframe(self, df):
+    def _create_stats_dataframe(self, df, scan):
         """Create statistics dataframe for export"""
         try:
-            numeric_columns = df.select_dtypes(include=['number']).columns
-            
-            if len(numeric_columns) == 0:
+            if scan.describe is None:
                 return pd.DataFrame({'Message': ['No numeric columns found']})
             
-            stats = df[numeric_columns].describe()
-            return stats
+            return scan.describe
             
         except Exception as e:
             logger.error(f"Error creating stats dataframe: {str(e)}")
             return pd.DataFrame({'Error': [str(e)]})
     
-    def _create_quality_dataframe(self, df):
+    def _create_quality_dataframe(self, df, scan):
         """Create data quality dataframe for export"""
         try:
-            quality_data = []
-            
-            for column in df.columns:
-                missing_count = df[column].isnull().sum()
-                missing_percentage = (missing_count / len(df)) * 100
-                unique_count = df[column].nunique()
-                data_type = str(df[column].dtype)
-                
-                quality_data.append({
-                    'Column': column,
-                    'Data Type': data_type,
-                    'Total Values': len(df),
-                    'Missing Values': missing_count,
-                    'Missing Percentage': round(missing_percentage, 2),
-                    'Unique Values': unique_count,
-                    'Uniqueness Percentage': round((unique_count / len(df)) * 100, 2)
-                })
-            
-            return pd.DataFrame(quality_data)
+            # One whole-frame pass per statistic, assembled column-wise
+            n_rows = len(df)
+            missing_counts = scan.missing_values
+            unique_counts = df.nunique()
+            
+            return pd.DataFrame({
+                'Column': df.columns,
+                'Data Type': scan.dtypes.astype(str).to_numpy(),
+                'Total Values': n_rows,
+                'Missing Values': missing_counts.to_numpy(),
+                'Missing Percentage': (missing_counts / n_rows * 100).round(2).to_numpy(),
+                'Unique Values': unique_counts.to_numpy(),
+                'Uniqueness Percentage': (unique_counts / n_rows * 100).round(2).to_numpy()
+            })
             
         except Exception as e:
             logger.error(f"Error creating quality dataframe: {str(e)}")
             return pd.DataFrame({'Error': [str(e)]})
     
-    def _create_column_info_dataframe(self, df):
+    def _create_column_info_dataframe(self, df, scan):
         """Create column information dataframe for export"""
         try:
             column_data = []
             
+            dtypes = scan.dtypes
+            null_counts = scan.missing_values
+            non_null_counts = len(df) - null_counts
+            memory_usage = scan.memory_usage
+            
             for column in df.columns:
                 col_info = {
                     'Column Name': column,
-                    'Data Type': str(df[column].dtype),
-                    'Non-Null Count': df[column].count(),
-                    'Null Count': df[column].isnull().sum(),
-                    'Memory Usage (bytes)': df[column].memory_usage(deep=True)
+                    'Data Type': str(dtypes[column]),
+                    'Non-Null Count': non_null_counts[column],
+                    'Null Count': null_counts[column],
+                    'Memory Usage (bytes)': memory_usage[column]
                 }
                 
-                if df[column].dtype in ['object']:
+                if dtypes[column] in ['object']:
                     # For categorical/text columns
                     col_info['Sample Values'] = ', '.join(df[column].dropna().astype(str).unique()[:5])
-                elif df[column].dtype in ['int64', 'float64']:
+                elif pd.api.types.is_numeric_dtype(dtypes[column]) and not pd.api.types.is_bool_dtype(dtypes[column]):
                     # For numeric columns
                     col_info['Min Value'] = df[column].min()
                     col_info['Max Value'] = df[column].max()
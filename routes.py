@@ -1,13 +1,27 @@
 import os
+import json
 import uuid
+import secrets
 import logging
-from flask import render_template, request, redirect, url_for, flash, session, send_file, jsonify
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from flask import render_template, request, redirect, url_for, flash, session, send_file, send_from_directory, jsonify, g
+from urllib.parse import unquote
+from werkzeug.exceptions import HTTPException
 from werkzeug.utils import secure_filename
 from app import app
-from data_processor import DataProcessor
+from data_processor import DataProcessor, DataFrameCache, dtype_buckets
 from chart_generator import ChartGenerator
 from export_handler import ExportHandler
 
+try:
+    from streaming_form_data import StreamingFormDataParser
+    from streaming_form_data.targets import FileTarget
+    STREAMING_UPLOADS_AVAILABLE = True
+except ImportError:
+    STREAMING_UPLOADS_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 # Initialize processors
@@ -20,10 +34,197 @@ except Exception as e:
     chart_generator = None
 export_handler = ExportHandler()
 
-ALLOWED_EXTENSIONS = {'csv', 'xlsx', 'xls'}
+# Parsed dataframes keyed by (path, mtime), so moving between pages skips re-parsing
+dataframe_cache = DataFrameCache(
+    max_entries=app.config['DATAFRAME_CACHE_ENTRIES'],
+    max_bytes=app.config['DATAFRAME_CACHE_BYTES']
+)
+# Custom chart HTML keyed by file version and chart request; charts are a pure function of both
+chart_cache = DataFrameCache(max_entries=256, max_bytes=64 * 1024 * 1024)
+
+ALLOWED_EXTENSIONS = frozenset({'csv', 'xlsx', 'xls'})
+UPLOAD_CHUNK_SIZE = 64 * 1024
+TOP_VALUE_COUNTS = 20  # Values kept per categorical column in the metadata sidecar
+
+def _file_extension(filename):
+    return os.path.splitext(filename)[1][1:].lower()
 
 def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return _file_extension(filename) in ALLOWED_EXTENSIONS
+
+def _stream_upload(file_path):
+    """Write the multipart 'file' field straight to file_path as the request body arrives"""
+    parser = StreamingFormDataParser(headers=request.headers)
+    parser.register('file', FileTarget(file_path))
+    while chunk := request.stream.read(UPLOAD_CHUNK_SIZE):
+        parser.data_received(chunk)
+    return os.path.exists(file_path)
+
+def _discard_upload(file_path):
+    """Remove an upload that was only partly written or could not be stored"""
+    if file_path is not None and os.path.exists(file_path):
+        os.remove(file_path)
+
+def _load_cached(file_path, mtime, usecols=None):
+    """Load a file, or only some of its columns, through the dataframe cache; the result is read-only"""
+    if usecols is not None:
+        # A cached full frame already holds every column subset
+        full_df = dataframe_cache.get((file_path, mtime))
+        if full_df is not None:
+            return full_df[usecols]
+        
+        key = (file_path, mtime, tuple(usecols))
+        df = dataframe_cache.get(key)
+        if df is None:
+            df = data_processor.load_data(file_path, dtype=_stored_dtypes(file_path), usecols=usecols)
+            if df is not None:
+                dataframe_cache.put(key, df)
+        return df
+    
+    key = (file_path, mtime)
+    df = dataframe_cache.get(key)
+    if df is None:
+        dtype = _stored_dtypes(file_path)
+        df = data_processor.load_data(file_path, dtype=dtype)
+        if df is None and dtype:
+            # The file no longer parses with its recorded dtypes; infer them again
+            df = data_processor.load_data(file_path)
+        if df is not None:
+            dataframe_cache.put(key, df)
+    return df
+
+def _load_file(file_path, usecols=None):
+    """Load an uploaded file, or return None if it is gone or cannot be parsed"""
+    if not os.path.exists(file_path):
+        return None
+    return _load_cached(file_path, os.path.getmtime(file_path), usecols)
+
+def _file_record_path(file_id):
+    return os.path.join(app.config['UPLOAD_FOLDER'], f"{file_id}.file.json")
+
+def _write_file_record(file_id, record):
+    with open(_file_record_path(file_id), 'w') as f:
+        json.dump(record, f)
+
+def _file_record():
+    """The session's upload record from the server-side store, or None if there is none"""
+    if 'file_record' not in g:
+        # The cookie only carries file_id, so its size no longer grows with the data
+        file_id = session.get('file_id')
+        record_path = _file_record_path(file_id) if file_id else None
+        if record_path and os.path.exists(record_path):
+            with open(record_path) as f:
+                g.file_record = json.load(f)
+        else:
+            g.file_record = None
+    return g.file_record
+
+@app.context_processor
+def inject_current_upload():
+    return {'current_upload': _file_record()}
+
+def _current_path():
+    """Path of the session's current data file"""
+    return os.path.join(app.config['UPLOAD_FOLDER'], _file_record()['current_file'])
+
+def _current_df(usecols=None):
+    """The session's current dataframe, loaded at most once per request; the result is read-only"""
+    df = g.get('df')
+    if df is not None:
+        return df if usecols is None else df[usecols]
+    
+    df = _load_file(_current_path(), usecols)
+    if usecols is None:
+        g.df = df
+    return df
+
+@app.teardown_request
+def _release_current_df(exc):
+    # The process-wide cache owns the frame beyond this request
+    g.pop('df', None)
+
+def _factorized(file_path, column, keys):
+    """Sorted pd.factorize of a file's column, kept in the dataframe cache for reuse across y columns"""
+    # Hashing the keys is nearly all of a group-by's cost; the per-y sum afterwards is one pass
+    key = (file_path, os.path.getmtime(file_path), 'factorized', column)
+    factorized = dataframe_cache.get(key)
+    if factorized is None:
+        codes, uniques = pd.factorize(keys, sort=True)
+        factorized = (codes, uniques)
+        dataframe_cache.put(key, factorized, size=codes.nbytes + uniques.memory_usage(deep=True))
+    return factorized
+
+def _metadata_path(file_path):
+    return f"{file_path}.meta.json"
+
+def _json_default(value):
+    """Convert the numpy scalars and dtypes found in stats dicts for json.dump"""
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+def _build_metadata(df):
+    """Everything the preview, clean and dashboard pages show that depends only on the data"""
+    # Partitioned once and cached on the frame; get_basic_stats below reuses it
+    numeric_cols, categorical_cols, _ = dtype_buckets(df)
+    return {
+        'shape': df.shape,
+        'columns': list(df.columns),
+        'dtypes': {col: str(dtype) for col, dtype in df.dtypes.items()},
+        'numeric_cols': list(numeric_cols),
+        'categorical_cols': list(categorical_cols),
+        'basic_stats': data_processor.get_basic_stats(df),
+        'quality_info': data_processor.get_data_quality_info(df),
+        'top_value_counts': {
+            col: list(df[col].value_counts().head(TOP_VALUE_COUNTS).items())
+            for col in categorical_cols
+        },
+        'histograms': {
+            col: {'edges': bins[0].tolist(), 'counts': bins[1].tolist()}
+            for col in numeric_cols
+            if (bins := data_processor.histogram_bins(df[col])) is not None
+        }
+    }
+
+def _write_metadata(file_path, df):
+    """Write the metadata sidecar for a data file and return the metadata"""
+    metadata = _build_metadata(df)
+    with open(_metadata_path(file_path), 'w') as f:
+        json.dump(metadata, f, default=_json_default)
+    return metadata
+
+def _stored_dtypes(file_path):
+    """Dtype map recorded in a text file's metadata sidecar, or None"""
+    meta_path = _metadata_path(file_path)
+    if file_path.endswith('.parquet') or not os.path.exists(meta_path):
+        return None
+    if os.path.getmtime(meta_path) < os.path.getmtime(file_path):
+        return None
+    with open(meta_path) as f:
+        return json.load(f).get('dtypes')
+
+def _top_value_counts(metadata, column, n):
+    """The n most frequent values of a column and their counts from the sidecar, or None if not recorded"""
+    pairs = metadata['top_value_counts'].get(column)
+    if pairs is None or n > TOP_VALUE_COUNTS:
+        return None
+    pairs = pairs[:n]
+    return [value for value, _ in pairs], [count for _, count in pairs]
+
+def _load_metadata(file_path):
+    """Read a data file's metadata sidecar, rebuilding it if missing or older than the file"""
+    if not os.path.exists(file_path):
+        return None
+    
+    meta_path = _metadata_path(file_path)
+    if os.path.exists(meta_path) and os.path.getmtime(meta_path) >= os.path.getmtime(file_path):
+        with open(meta_path) as f:
+            return json.load(f)
+    
+    df = _load_file(file_path)
+    if df is None:
+        return None
+    return _write_metadata(file_path, df)
 
 @app.route('/')
 def index():
@@ -32,39 +233,76 @@ def index():
 @app.route('/upload', methods=['GET', 'POST'])
 def upload():
     if request.method == 'POST':
-        if 'file' not in request.files:
-            flash('No file selected', 'error')
-            return redirect(request.url)
-        
-        file = request.files['file']
-        if file.filename == '':
-            flash('No file selected', 'error')
-            return redirect(request.url)
+        # The upload page names the file in a header, so the body can be streamed
+        # to disk without Werkzeug buffering the whole multipart form first
+        streamed_filename = unquote(request.headers.get('X-Filename', ''))
+        if STREAMING_UPLOADS_AVAILABLE and streamed_filename and request.mimetype == 'multipart/form-data':
+            file = None
+            filename = streamed_filename
+        else:
+            if 'file' not in request.files:
+                flash('No file selected', 'error')
+                return redirect(request.url)
+            
+            file = request.files['file']
+            filename = file.filename
+            if filename == '':
+                flash('No file selected', 'error')
+                return redirect(request.url)
         
-        if file and allowed_file(file.filename):
+        if filename and allowed_file(filename):
+            file_path = None
             try:
                 # Generate unique filename
-                if file.filename is None:
-                    flash('Invalid file name', 'error')
-                    return redirect(request.url)
-                
-                original_filename = secure_filename(file.filename)
-                file_extension = original_filename.rsplit('.', 1)[1].lower()
-                unique_filename = f"{uuid.uuid4()}.{file_extension}"
+                original_filename = secure_filename(filename)
+                # Taken before secure_filename, which can strip a non-ASCII name down to its extension
+                file_extension = _file_extension(filename)
+                unique_filename = f"{uuid.uuid4().hex}.{file_extension}"
                 file_path = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
                 
                 # Save file
-                file.save(file_path)
+                if file is not None:
+                    file.save(file_path)
+                elif not _stream_upload(file_path):
+                    flash('No file selected', 'error')
+                    return redirect(request.url)
                 
-                # Store in session
-                session['current_file'] = unique_filename
-                session['original_filename'] = original_filename
+                # Parse once here; later routes read the columnar copy instead of re-parsing,
+                # so the workbook is not kept in the open-workbook cache
+                df = data_processor.load_data(file_path, reuse_workbook=False)
+                if df is None:
+                    os.remove(file_path)
+                    flash('Error loading file. Please check the file and try again.', 'error')
+                    return redirect(request.url)
+                
+                parquet_path = data_processor.convert_to_parquet(df, file_path)
+                if parquet_path is not None:
+                    os.remove(file_path)
+                    file_path = parquet_path
+                    unique_filename = os.path.basename(parquet_path)
+                dataframe_cache.put((file_path, os.path.getmtime(file_path)), df)
+                _write_metadata(file_path, df)
+                
+                # Store the upload record server-side and only its id in the session
+                file_id = secrets.token_urlsafe(16)
+                _write_file_record(file_id, {
+                    'current_file': unique_filename,
+                    'original_filename': original_filename,
+                    'uploaded_at': datetime.now().isoformat()
+                })
+                session['file_id'] = file_id
+                g.pop('file_record', None)
                 
                 flash('File uploaded successfully!', 'success')
                 return redirect(url_for('preview'))
                 
+            except HTTPException:
+                # An over-limit body keeps its 413 rather than turning into a flash
+                _discard_upload(file_path)
+                raise
             except Exception as e:
                 logger.error(f"Upload error: {str(e)}")
+                _discard_upload(file_path)
                 flash('Error uploading file. Please try again.', 'error')
                 return redirect(request.url)
         else:
@@ -74,33 +312,35 @@ def upload():
 
 @app.route('/preview')
 def preview():
-    if 'current_file' not in session:
+    if _file_record() is None:
         flash('No file uploaded. Please upload a file first.', 'error')
         return redirect(url_for('upload'))
     
     try:
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], session['current_file'])
-        df = data_processor.load_data(file_path)
+        file_path = _current_path()
+        metadata = _load_metadata(file_path)
         
-        if df is None:
+        if metadata is None:
             flash('Error loading file. Please try uploading again.', 'error')
             return redirect(url_for('upload'))
         
         # Get basic statistics
-        stats = data_processor.get_basic_stats(df)
-        
-        # Store dataframe info in session
-        session['data_shape'] = df.shape
-        session['columns'] = list(df.columns)
+        stats = metadata['basic_stats']
         
-        # Get preview data (first 20 rows)
-        preview_data = df.head(20).to_dict('records')
+        # Get preview data (first 20 rows) as columnar-encoded JSON for the client to render
+        head = data_processor.load_head(file_path, 20)
+        if head is None:
+            flash('Error loading file. Please try uploading again.', 'error')
+            return redirect(url_for('upload'))
+        # Escaped like Jinja's tojson so a cell holding </script> cannot close the data block
+        preview_json = (head.to_json(orient='records', date_format='iso')
+                        .replace('<', '\\u003c').replace('>', '\\u003e').replace('&', '\\u0026'))
         
         return render_template('preview.html', 
-                             data=preview_data, 
-                             columns=df.columns, 
+                             preview_json=preview_json, 
+                             columns=metadata['columns'], 
                              stats=stats,
-                             filename=session.get('original_filename', 'Unknown'))
+                             filename=_file_record().get('original_filename', 'Unknown'))
         
     except Exception as e:
         logger.error(f"Preview error: {str(e)}")
@@ -109,22 +349,25 @@ def preview():
 
 @app.route('/clean', methods=['GET', 'POST'])
 def clean():
-    if 'current_file' not in session:
+    if _file_record() is None:
         flash('No file uploaded. Please upload a file first.', 'error')
         return redirect(url_for('upload'))
     
     try:
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], session['current_file'])
-        df = data_processor.load_data(file_path)
-        
-        if df is None:
-            flash('Error loading file. Please try uploading again.', 'error')
-            return redirect(url_for('upload'))
+        file_path = _current_path()
         
         if request.method == 'POST':
+            df = _current_df()
+            if df is None:
+                flash('Error loading file. Please try uploading again.', 'error')
+                return redirect(url_for('upload'))
+            
             # Apply cleaning operations based on form data
             clean_options = request.form.to_dict()
             
+            # The loaded frame is shared through the cache, so clean a private copy
+            df = df.copy()
+            
             if 'remove_duplicates' in clean_options:
                 df = data_processor.remove_duplicates(df)
             
@@ -135,25 +378,41 @@ def clean():
             if 'remove_outliers' in clean_options:
                 df = data_processor.remove_outliers(df)
             
-            # Save cleaned data
-            cleaned_filename = f"cleaned_{session['current_file']}"
-            cleaned_path = os.path.join(app.config['UPLOAD_FOLDER'], cleaned_filename)
+            # Save cleaned data as Parquet so the dashboard hop reads it without parsing
+            cleaned_stem = os.path.join(app.config['UPLOAD_FOLDER'], f"cleaned_{uuid.uuid4().hex}")
+            cleaned_path = data_processor.convert_to_parquet(df, f"{cleaned_stem}.parquet")
+            if cleaned_path is None:
+                # No pyarrow, or no Arrow schema for this frame: keep a copy in the input's format
+                if _file_record()['current_file'].endswith(('.xlsx', '.xls')):
+                    cleaned_path = f"{cleaned_stem}.xlsx"
+                    df.to_excel(cleaned_path, index=False)
+                else:
+                    cleaned_path = f"{cleaned_stem}.csv"
+                    df.to_csv(cleaned_path, index=False)
+            cleaned_filename = os.path.basename(cleaned_path)
             
-            if session['current_file'].endswith('.csv'):
-                df.to_csv(cleaned_path, index=False)
-            else:
-                df.to_excel(cleaned_path, index=False)
+            # Prime the cache so the dashboard does not re-parse what we just wrote
+            dataframe_cache.put(
+                (cleaned_path, os.path.getmtime(cleaned_path)), df.reset_index(drop=True)
+            )
+            _write_metadata(cleaned_path, df)
             
-            session['current_file'] = cleaned_filename
+            record = dict(_file_record(), current_file=cleaned_filename)
+            _write_file_record(session['file_id'], record)
+            g.file_record = record
+            g.pop('df', None)
             flash('Data cleaned successfully!', 'success')
             return redirect(url_for('dashboard'))
         
         # Get data quality info
-        quality_info = data_processor.get_data_quality_info(df)
+        metadata = _load_metadata(file_path)
+        if metadata is None:
+            flash('Error loading file. Please try uploading again.', 'error')
+            return redirect(url_for('upload'))
         
         return render_template('clean.html', 
-                             quality_info=quality_info,
-                             filename=session.get('original_filename', 'Unknown'))
+                             quality_info=metadata['quality_info'],
+                             filename=_file_record().get('original_filename', 'Unknown'))
         
     except Exception as e:
         logger.error(f"Clean error: {str(e)}")
@@ -162,117 +421,122 @@ def clean():
 
 @app.route('/dashboard')
 def dashboard():
-    if 'current_file' not in session:
+    if _file_record() is None:
         flash('No file uploaded. Please upload a file first.', 'error')
         return redirect(url_for('upload'))
     
     try:
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], session['current_file'])
-        df = data_processor.load_data(file_path)
+        file_path = _current_path()
+        metadata = _load_metadata(file_path)
         
-        if df is None:
+        if metadata is None:
             flash('Error loading file. Please try uploading again.', 'error')
             return redirect(url_for('upload'))
         
         # Get basic statistics
-        stats = data_processor.get_basic_stats(df)
+        stats = metadata['basic_stats']
         
         # Generate charts for numeric columns
         charts = []
-        numeric_columns = df.select_dtypes(include=['number']).columns
-        categorical_columns = df.select_dtypes(include=['object']).columns
+        numeric_columns = metadata['numeric_cols']
+        categorical_columns = metadata['categorical_cols']
         
         # Only create charts if chart_generator is available
         if chart_generator is not None:
-            # Create various chart types
+            # Read just the columns the charts below use; the bar chart comes from the sidecar
+            chart_columns = numeric_columns[:3]
+            df = _current_df(usecols=chart_columns) if chart_columns else None
+            if chart_columns and df is None:
+                flash('Error loading file. Please try uploading again.', 'error')
+                return redirect(url_for('upload'))
+            
+            # Collect (title, chart type, arguments) for each chart, then render them as one batch
+            chart_specs = []
             if len(numeric_columns) > 0:
-                # Histogram for first numeric column
-                try:
-                    hist_chart = chart_generator.create_histogram(df, numeric_columns[0])
-                    if hist_chart:
-                        charts.append({
-                            'title': f'Distribution of {numeric_columns[0]}',
-                            'chart': hist_chart,
-                            'type': 'histogram'
-                        })
-                except Exception as e:
-                    logger.error(f"Error creating histogram: {e}")
+                # Histogram for first numeric column, from the bins in the sidecar
+                bins = metadata.get('histograms', {}).get(numeric_columns[0])
+                if bins is not None:
+                    chart_specs.append((
+                        f'Distribution of {numeric_columns[0]}', 'binned_histogram',
+                        {'edges': bins['edges'], 'counts': bins['counts'], 'column': numeric_columns[0]}
+                    ))
+                else:
+                    chart_specs.append((
+                        f'Distribution of {numeric_columns[0]}', 'histogram',
+                        {'df': df, 'column': numeric_columns[0]}
+                    ))
                 
                 # Box plot for numeric columns
-                if len(numeric_columns) >= 1:
-                    try:
-                        box_chart = chart_generator.create_box_plot(df, list(numeric_columns[:3]))
-                        if box_chart:
-                            charts.append({
-                                'title': 'Box Plot of Numeric Columns',
-                                'chart': box_chart,
-                                'type': 'box'
-                            })
-                    except Exception as e:
-                        logger.error(f"Error creating box plot: {e}")
+                chart_specs.append((
+                    'Box Plot of Numeric Columns', 'box',
+                    {'df': df, 'columns': list(numeric_columns[:3])}
+                ))
             
             # Bar chart for categorical data
             if len(categorical_columns) > 0:
                 try:
                     cat_col = categorical_columns[0]
-                    value_counts = df[cat_col].value_counts().head(10)
-                    bar_chart = chart_generator.create_bar_chart(
-                        value_counts.index.tolist(),
-                        value_counts.values.tolist(),
-                        cat_col,
-                        'Count'
-                    )
-                    if bar_chart:
-                        charts.append({
-                            'title': f'Distribution of {cat_col}',
-                            'chart': bar_chart,
-                            'type': 'bar'
-                        })
+                    values, counts = _top_value_counts(metadata, cat_col, 10)
+                    chart_specs.append((
+                        f'Distribution of {cat_col}', 'bar',
+                        {
+                            'x_data': values,
+                            'y_data': counts,
+                            'x_title': cat_col,
+                            'y_title': 'Count'
+                        }
+                    ))
                 except Exception as e:
                     logger.error(f"Error creating bar chart: {e}")
             
             # Scatter plot if we have at least 2 numeric columns
             if len(numeric_columns) >= 2:
-                try:
-                    scatter_chart = chart_generator.create_scatter_plot(
-                        df, numeric_columns[0], numeric_columns[1]
-                    )
-                    if scatter_chart:
-                        charts.append({
-                            'title': f'{numeric_columns[0]} vs {numeric_columns[1]}',
-                            'chart': scatter_chart,
-                            'type': 'scatter'
-                        })
-                except Exception as e:
-                    logger.error(f"Error creating scatter plot: {e}")
+                chart_specs.append((
+                    f'{numeric_columns[0]} vs {numeric_columns[1]}', 'scatter',
+                    {'df': df, 'x_column': numeric_columns[0], 'y_column': numeric_columns[1]}
+                ))
+            
+            rendered = chart_generator.render_many(
+                [(chart_type, kwargs) for _, chart_type, kwargs in chart_specs], timeout=10
+            )
+            for (title, chart_type, _), chart in zip(chart_specs, rendered):
+                if chart:
+                    charts.append({
+                        'title': title,
+                        'chart': chart,
+                        'type': chart_type
+                    })
         else:
             logger.warning("Chart generator not available - no charts will be created")
         
         return render_template('dashboard.html', 
                              stats=stats,
                              charts=charts,
-                             columns=list(df.columns),
-                             filename=session.get('original_filename', 'Unknown'))
+                             columns=metadata['columns'],
+                             filename=_file_record().get('original_filename', 'Unknown'))
         
     except Exception as e:
         logger.error(f"Dashboard error: {str(e)}")
         flash('Error generating dashboard. Please try again.', 'error')
         return redirect(url_for('preview'))
 
+def _chart_response(chart_html, title):
+    response = jsonify({'chart': chart_html, 'title': title})
+    response.headers['Cache-Control'] = 'private, max-age=60'
+    return response
+
 @app.route('/generate_chart', methods=['POST'])
 def generate_chart():
     """Generate custom chart based on user selection"""
-    if 'current_file' not in session:
+    if _file_record() is None:
         return jsonify({'error': 'No file uploaded'}), 400
     
     if chart_generator is None:
         return jsonify({'error': 'Chart generation is not available. Please check the system configuration.'}), 500
     
     try:
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], session['current_file'])
-        df = data_processor.load_data(file_path)
-        
-        if df is None:
+        file_path = _current_path()
+        if not os.path.exists(file_path):
             return jsonify({'error': 'Error loading data'}), 400
         
         json_data = request.get_json()
@@ -284,52 +548,84 @@ def generate_chart():
         y_column = json_data.get('y_column')
         title = json_data.get('title', f'{chart_type.title()} Chart' if chart_type else 'Chart')
         
+        # The page shows one custom chart at a time, so reusing its div id is safe
+        cache_key = (file_path, os.path.getmtime(file_path), json.dumps([chart_type, x_column, y_column]))
+        chart_html = chart_cache.get(cache_key)
+        if chart_html is not None:
+            return _chart_response(chart_html, title)
+        
+        metadata = _load_metadata(file_path)
+        if metadata is None:
+            return jsonify({'error': 'Error loading data'}), 400
+        
         logger.info(f"Generating chart: type={chart_type}, x={x_column}, y={y_column}")
-        chart_html = None
+        # Charts are checked against the sidecar, and only the columns they plot are ever loaded
+        known_columns = set(metadata['columns'])
+        has_x = x_column in known_columns
+        has_y = bool(y_column) and y_column in known_columns
+        
+        def chart_df(*columns):
+            df = _current_df(usecols=list(dict.fromkeys(columns)))
+            if df is None:
+                raise ValueError('Error loading data')
+            return df
         
         if chart_type == 'bar':
-            if x_column in df.columns:
-                if y_column and y_column in df.columns:
+            if has_x:
+                if has_y:
                     # Grouped data
-                    grouped = df.groupby(x_column)[y_column].sum()
+                    df = chart_df(x_column, y_column)
+                    if x_column != y_column and pd.api.types.is_numeric_dtype(df[y_column]):
+                        codes, keys = _factorized(_current_path(), x_column, df[x_column])
+                        sums = data_processor.group_sum(codes, len(keys), df[y_column])
+                    else:
+                        grouped = df.groupby(x_column)[y_column].sum()
+                        keys, sums = grouped.index, grouped.to_numpy()
                     chart_html = chart_generator.create_bar_chart(
-                        grouped.index.tolist(), grouped.values.tolist(), x_column, y_column
+                        keys.to_numpy(), sums, x_column, y_column
                     )
                 else:
-                    # Value counts
-                    value_counts = df[x_column].value_counts().head(20)
-                    chart_html = chart_generator.create_bar_chart(
-                        value_counts.index.tolist(), value_counts.values.tolist(), x_column, 'Count'
-                    )
+                    # Value counts, precomputed for categorical columns
+                    top_values = _top_value_counts(metadata, x_column, 20)
+                    if top_values is None:
+                        value_counts = chart_df(x_column)[x_column].value_counts().head(20)
+                        top_values = value_counts.index.to_numpy(), value_counts.to_numpy()
+                    chart_html = chart_generator.create_bar_chart(*top_values, x_column, 'Count')
         
         elif chart_type == 'line':
-            if x_column in df.columns and y_column in df.columns:
-                chart_html = chart_generator.create_line_chart(df, x_column, y_column)
+            if has_x and has_y:
+                chart_html = chart_generator.create_line_chart(chart_df(x_column, y_column), x_column, y_column)
         
         elif chart_type == 'scatter':
-            if x_column in df.columns and y_column in df.columns:
-                chart_html = chart_generator.create_scatter_plot(df, x_column, y_column)
+            if has_x and has_y:
+                chart_html = chart_generator.create_scatter_plot(chart_df(x_column, y_column), x_column, y_column)
         
         elif chart_type == 'histogram':
-            if x_column in df.columns:
-                chart_html = chart_generator.create_histogram(df, x_column)
+            if has_x:
+                bins = metadata.get('histograms', {}).get(x_column)
+                if bins is not None:
+                    chart_html = chart_generator.create_binned_histogram(bins['edges'], bins['counts'], x_column)
+                else:
+                    chart_html = chart_generator.create_histogram(chart_df(x_column), x_column)
         
         elif chart_type == 'box':
-            columns = [x_column] if x_column in df.columns else []
-            if y_column and y_column in df.columns:
+            columns = [x_column] if has_x else []
+            if has_y:
                 columns.append(y_column)
             if columns:
-                chart_html = chart_generator.create_box_plot(df, columns)
+                chart_html = chart_generator.create_box_plot(chart_df(*columns), columns)
         
         elif chart_type == 'pie':
-            if x_column in df.columns:
-                value_counts = df[x_column].value_counts().head(10)
-                chart_html = chart_generator.create_pie_chart(
-                    value_counts.index.tolist(), value_counts.values.tolist()
-                )
+            if has_x:
+                top_values = _top_value_counts(metadata, x_column, 10)
+                if top_values is None:
+                    value_counts = chart_df(x_column)[x_column].value_counts().head(10)
+                    top_values = value_counts.index.to_numpy(), value_counts.to_numpy()
+                chart_html = chart_generator.create_pie_chart(*top_values)
         
         if chart_html:
-            return jsonify({'chart': chart_html, 'title': title})
+            chart_cache.put(cache_key, chart_html, size=len(chart_html))
+            return _chart_response(chart_html, title)
         else:
             return jsonify({'error': 'Could not generate chart with selected parameters'}), 400
         
@@ -339,13 +635,19 @@ def generate_chart():
 
 @app.route('/export/<format>')
 def export_data(format):
-    if 'current_file' not in session:
+    if _file_record() is None:
         flash('No file uploaded. Please upload a file first.', 'error')
         return redirect(url_for('upload'))
     
     try:
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], session['current_file'])
-        df = data_processor.load_data(file_path)
+        # The stored file is already in the requested format: send it without parsing or serializing
+        file_path = _current_path()
+        if _file_extension(file_path) == format.lower() and os.path.exists(file_path):
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            return send_file(os.path.abspath(file_path), as_attachment=True, conditional=True,
+                             download_name=f"exported_data_{timestamp}.{format.lower()}")
+        
+        df = _current_df()
         
         if df is None:
             flash('Error loading file. Please try uploading again.', 'error')
@@ -367,20 +669,21 @@ def export_data(format):
 
 @app.route('/export_summary')
 def export_summary():
-    if 'current_file' not in session:
+    if _file_record() is None:
         flash('No file uploaded. Please upload a file first.', 'error')
         return redirect(url_for('upload'))
     
     try:
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], session['current_file'])
-        df = data_processor.load_data(file_path)
+        df = _current_df()
         
         if df is None:
             flash('Error loading file. Please try uploading again.', 'error')
             return redirect(url_for('upload'))
         
         # Generate summary report
-        export_path = export_handler.export_summary_report(df, app.config['EXPORT_FOLDER'])
+        export_path = export_handler.export_summary_report(
+            df, app.config['EXPORT_FOLDER'], scan=data_processor.scan(df)
+        )
         
         if export_path and os.path.exists(export_path):
             return send_file(export_path, as_attachment=True)
@@ -395,11 +698,16 @@ def export_summary():
 
 @app.route('/manifest.json')
 def manifest():
-    return send_file('static/manifest.json')
+    response = send_from_directory(app.static_folder, 'manifest.json', mimetype='application/manifest+json')
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
 
 @app.route('/sw.js')
 def service_worker():
-    return send_file('static/sw.js')
+    # Browsers must revalidate the worker script so updates reach installed clients
+    response = send_from_directory(app.static_folder, 'sw.js', mimetype='application/javascript')
+    response.headers['Cache-Control'] = 'no-cache, max-age=0, must-revalidate'
+    return response
 
 @app.errorhandler(404)
 def not_found(error):
@@ -0,0 +1,48 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import data_processor
+from data_processor import DataProcessor
+from export_handler import ExportHandler
+
+SAMPLE_CSV = """id,when,day,clock,flag,name,value,zoned
+1,2020-01-01 10:00:00,2020-01-01,10:00:00,true,a<b,1.5,2020-01-01T00:00:00Z
+2,2020-01-02 11:00:00,2020-01-02,11:30:00,False,,2.0,2020-01-02T00:00:00Z
+3,,,,TRUE,c,,
+"""
+
+
+@unittest.skipUnless(data_processor.PYARROW_AVAILABLE, "pyarrow is not installed")
+class CsvEngineTest(unittest.TestCase):
+    """The Arrow CSV path must load the same frame the C engine does"""
+    
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmpdir.name, 'sample.csv')
+        with open(self.csv_path, 'w', encoding='utf-8') as f:
+            f.write(SAMPLE_CSV)
+    
+    def tearDown(self):
+        self.tmpdir.cleanup()
+    
+    def _load_and_export(self):
+        df = DataProcessor().load_data(self.csv_path)
+        json_path = ExportHandler().export_data(df, 'json', self.tmpdir.name)
+        with open(json_path, 'rb') as f:
+            exported = f.read()
+        os.remove(json_path)
+        return df, exported
+    
+    def test_dtypes_and_json_export_match_c_engine(self):
+        arrow_df, arrow_json = self._load_and_export()
+        with mock.patch.object(data_processor, 'PYARROW_AVAILABLE', False):
+            c_df, c_json = self._load_and_export()
+        
+        self.assertEqual(arrow_df.dtypes.to_dict(), c_df.dtypes.to_dict())
+        self.assertEqual(arrow_json, c_json)
+
+
+if __name__ == '__main__':
+    unittest.main()
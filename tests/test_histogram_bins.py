@@ -0,0 +1,31 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from data_processor import DataProcessor
+
+
+class HistogramBinsTest(unittest.TestCase):
+    """Integer columns get integer-aligned bins rather than float-width ones"""
+    
+    def test_small_range_integers_have_no_empty_interior_bins(self):
+        ratings = pd.Series(np.random.default_rng(0).integers(1, 6, 10000))
+        edges, counts = DataProcessor.histogram_bins(ratings)
+        
+        np.testing.assert_array_equal(edges, [0.5, 1.5, 2.5, 3.5, 4.5, 5.5])
+        self.assertFalse((counts[1:-1] == 0).any())
+        self.assertEqual(counts.sum(), len(ratings))
+    
+    def test_wide_integer_range_keeps_integer_widths_within_max_bins(self):
+        values = pd.Series(np.random.default_rng(0).integers(0, 10**6, 1000))
+        edges, counts = DataProcessor.histogram_bins(values, max_bins=100)
+        
+        self.assertLessEqual(len(counts), 100)
+        widths = np.diff(edges)
+        self.assertTrue((widths == widths[0]).all() and widths[0] == int(widths[0]))
+        self.assertEqual(counts.sum(), len(values))
+
+
+if __name__ == '__main__':
+    unittest.main()